@@ -10,6 +10,7 @@ import click
 
 from ..core import PasswordEntry, PasswordStorage, PasswordGenerator
 from ..core.validators import InputValidator
+from ..crypto import EncryptionService
 from ..exceptions import ValidationError, AuthenticationError, StorageError
 from ..logger import log_audit, get_logger
 
@@ -78,15 +79,24 @@ def init():
         handle_error(str(e), e)
         sys.exit(1)
 
-    # Initialize the password file
+    # Initialize the password file, sizing the KDF cost for this machine
     try:
-        storage.initialize(master_password)
+        storage.initialize(master_password, EncryptionService.calibrate_iterations())
         log_audit("INIT", {"action": "initialize"})
         click.secho("Password manager initialized successfully.", fg="green", bold=True)
     except Exception as e:
         handle_error(f"Failed to initialize: {str(e)}", e)
         sys.exit(1)
 
+    # Warn about OpenSSL builds without hardware AES
+    result = EncryptionService.self_test_hardware()
+    if not result["accelerated"]:
+        get_logger().warning(
+            "AES-256-GCM runs at %.0f MB/s; OpenSSL may lack AES-NI support. "
+            "Reinstall cryptography from the official wheels (pip install --force-reinstall cryptography).",
+            result["aes_gcm_mbps"]
+        )
+
 
 @cli.command()
 @click.option("--name", "-n", required=True, help="Name of the entry (e.g., website or app name)")
@@ -179,10 +189,10 @@ def add(name: str, username: str, password: Optional[str], notes: Optional[str],
         sys.exit(1)
 
 
-@cli.command()
+@cli.command("list")
 @click.option("--name", "-n", help="Filter by name (case-insensitive substring match)")
 @click.option("--json", "json_output", is_flag=True, help="Output in JSON format")
-def list(name: Optional[str], json_output: bool):
+def list_entries(name: Optional[str], json_output: bool):
     """List all password entries."""
     # Get master password
     master_password = get_master_password()
@@ -227,7 +237,7 @@ def list(name: Optional[str], json_output: bool):
     # Print entries
     row_format = f"| {{:<{id_width}}} | {{:<{name_width}}} | {{:<{username_width}}} |"
     for i, entry in enumerate(sorted_entries):
-        short_id = entry.id[:6]  # Show only first 6 chars of UUID
+        short_id = entry.id[:6]  # Show only first 6 chars of the ID
         # Alternate row colors for better readability
         color = "bright_white" if i % 2 == 0 else "white"
         click.secho(row_format.format(short_id, entry.name, entry.username), fg=color)
@@ -347,19 +357,20 @@ def generate(length: int, include_lowercase: bool, include_uppercase: bool,
         handle_error(str(e), e)
         sys.exit(1)
 
-    for i in range(count):
-        try:
-            password = PasswordGenerator.generate(
-                length=length,
-                include_lowercase=include_lowercase,
-                include_uppercase=include_uppercase,
-                include_digits=include_digits,
-                include_symbols=include_symbols
-            )
-        except ValueError as e:
-            handle_error(str(e), e)
-            sys.exit(1)
+    try:
+        passwords = PasswordGenerator.generate_many(
+            count,
+            length=length,
+            include_lowercase=include_lowercase,
+            include_uppercase=include_uppercase,
+            include_digits=include_digits,
+            include_symbols=include_symbols
+        )
+    except ValueError as e:
+        handle_error(str(e), e)
+        sys.exit(1)
 
+    for i, password in enumerate(passwords):
         if count > 1:
             click.secho(f"{i+1}. ", fg="blue", nl=False)
             click.secho(password, fg="bright_green")
@@ -606,5 +617,37 @@ def export_data(export_file: str, format: str):
     click.secho(f"File: {export_file}", fg="bright_black")
 
 
+@cli.group("audit-log")
+def audit_log():
+    """Inspect the audit log."""
+    pass
+
+
+@audit_log.command("show")
+@click.option("--limit", "-n", default=50, type=click.IntRange(min=0), help="Number of most recent events to show (0 for all)")
+@click.option("--json", "json_output", is_flag=True, help="Output in JSON format")
+def show_audit_log(limit: int, json_output: bool):
+    """Show recent audit events."""
+    import json
+    from collections import deque
+    from datetime import datetime
+    from ..logger import read_audit_log
+
+    path = get_logger().audit_log_path
+    if not os.path.exists(path):
+        click.secho("No audit events recorded yet.", fg="yellow")
+        return
+
+    events = deque(read_audit_log(path), maxlen=limit or None)
+
+    if json_output:
+        click.echo(json.dumps(list(events), indent=2))
+        return
+
+    for event in events:
+        timestamp = datetime.fromtimestamp(event["time"]).strftime("%Y-%m-%d %H:%M:%S")
+        click.echo(f"{timestamp}  {event['action']}  {json.dumps(event['details'])}")
+
+
 if __name__ == "__main__":
     cli()
\ No newline at end of file
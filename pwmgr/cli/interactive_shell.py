@@ -14,6 +14,7 @@ import click
 from click.testing import CliRunner
 
 from ..core import PasswordStorage, PasswordGenerator
+from ..crypto import EncryptionService
 from .commands import cli, get_master_password
 
 # Try to import readline for command history and completion
@@ -139,7 +140,9 @@ class PasswordManagerShell(cmd.Cmd):
         click.secho(f"Successfully loaded {len(self.entries)} password entries.", fg="green")
 
     def postloop(self):
-        """Save command history on exit."""
+        """Drop cached keys and save command history on exit."""
+        EncryptionService.clear_key_cache()
+
         if HAS_READLINE and hasattr(self, '_history_file'):
             try:
                 readline.write_history_file(self._history_file)
@@ -273,7 +276,7 @@ class PasswordManagerShell(cmd.Cmd):
         # Print entries
         row_format = f"| {{:<{id_width}}} | {{:<{name_width}}} | {{:<{username_width}}} |"
         for i, entry in enumerate(sorted_entries):
-            short_id = entry.id[:6]  # Show only first 6 chars of UUID
+            short_id = entry.id[:6]  # Show only first 6 chars of the ID
             # Alternate row colors for better readability
             color = "bright_white" if i % 2 == 0 else "white"
             click.secho(row_format.format(short_id, entry.name, entry.username), fg=color)
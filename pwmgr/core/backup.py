@@ -91,7 +91,7 @@ class BackupManager:
             backup_path = os.path.join(self.backup_dir, filename)
 
             # Write backup file
-            with open(backup_path, 'w') as f:
+            with open(backup_path, 'wb') as f:
                 f.write(encrypted_data)
 
             log_audit("CREATE_BACKUP", {"path": backup_path, "entries_count": len(entries)})
@@ -120,7 +120,7 @@ class BackupManager:
                 raise BackupError(f"Backup file not found: {backup_path}", operation="restore")
 
             # Read and decrypt backup
-            with open(backup_path, 'r') as f:
+            with open(backup_path, 'rb') as f:
                 encrypted_data = f.read()
 
             json_data = EncryptionService.decrypt_password_data(encrypted_data, master_password)
@@ -215,7 +215,7 @@ class BackupManager:
                 raise BackupError(f"Backup file not found: {backup_path}", operation="info")
 
             # Read and decrypt backup
-            with open(backup_path, 'r') as f:
+            with open(backup_path, 'rb') as f:
                 encrypted_data = f.read()
 
             json_data = EncryptionService.decrypt_password_data(encrypted_data, master_password)
@@ -3,7 +3,8 @@ Password generator module.
 """
 import secrets
 import string
-from typing import List, Tuple
+import functools
+from typing import FrozenSet, List, Tuple
 
 
 class PasswordStrength:
@@ -49,6 +50,38 @@ class PasswordGenerator:
         Returns:
             A secure random password
 
+        Raises:
+            ValueError: If length is less than minimum required
+        """
+        return cls.generate_many(1, length, include_lowercase, include_uppercase,
+                                 include_digits, include_symbols)[0]
+
+    @classmethod
+    def generate_many(cls,
+                      count: int,
+                      length: int = 16,
+                      include_lowercase: bool = True,
+                      include_uppercase: bool = True,
+                      include_digits: bool = True,
+                      include_symbols: bool = True) -> List[str]:
+        """
+        Generate several secure random passwords from one batch of random bytes.
+
+        Characters are drawn uniformly from the union of the selected sets;
+        passwords missing a selected set are discarded and redrawn, so every
+        valid password is equally likely.
+
+        Args:
+            count: Number of passwords to generate
+            length: Length of each password (default: 16)
+            include_lowercase: Whether to include lowercase letters (default: True)
+            include_uppercase: Whether to include uppercase letters (default: True)
+            include_digits: Whether to include digits (default: True)
+            include_symbols: Whether to include symbols (default: True)
+
+        Returns:
+            A list of secure random passwords
+
         Raises:
             ValueError: If length is less than minimum required
         """
@@ -56,56 +89,44 @@ class PasswordGenerator:
         min_required = sum([include_lowercase, include_uppercase, include_digits, include_symbols])
         if length < min_required:
             raise ValueError(f"Password length must be at least {min_required} to include all selected character types")
+        if length < 1:
+            raise ValueError("Password length must be at least 1")
 
         # Ensure at least one character set is included
         if not any([include_lowercase, include_uppercase, include_digits, include_symbols]):
             include_lowercase = True
 
-        # Create character pool
-        char_pool = ""
-        if include_lowercase:
-            char_pool += cls.LOWERCASE
-        if include_uppercase:
-            char_pool += cls.UPPERCASE
-        if include_digits:
-            char_pool += cls.DIGITS
-        if include_symbols:
-            char_pool += cls.SYMBOLS
-
-        # Generate password
-        # First, ensure at least one character from each selected set is included
-        password_chars: List[str] = []
-
-        if include_lowercase:
-            password_chars.append(secrets.choice(cls.LOWERCASE))
-        if include_uppercase:
-            password_chars.append(secrets.choice(cls.UPPERCASE))
-        if include_digits:
-            password_chars.append(secrets.choice(cls.DIGITS))
-        if include_symbols:
-            password_chars.append(secrets.choice(cls.SYMBOLS))
-
-        # Fill the rest of the password with secure random characters
-        remaining_length = length - len(password_chars)
-        for _ in range(remaining_length):
-            password_chars.append(secrets.choice(char_pool))
-
-        # Shuffle using cryptographically secure random
-        cls._secure_shuffle(password_chars)
-
-        return ''.join(password_chars)
-
-    @staticmethod
-    def _secure_shuffle(items: List) -> None:
+        char_pool, required_sets = cls._char_sets(include_lowercase, include_uppercase,
+                                                  include_digits, include_symbols)
+
+        passwords: List[str] = []
+        while len(passwords) < count:
+            chars = _random_chars(char_pool, (count - len(passwords)) * length)
+            for i in range(0, len(chars), length):
+                candidate = chars[i:i + length]
+                # Rejection sampling: keep only passwords with every selected set
+                if all(not required.isdisjoint(candidate) for required in required_sets):
+                    passwords.append(candidate)
+
+        return passwords
+
+    @classmethod
+    @functools.lru_cache(maxsize=16)
+    def _char_sets(cls, include_lowercase: bool, include_uppercase: bool,
+                   include_digits: bool, include_symbols: bool) -> Tuple[str, Tuple[FrozenSet[str], ...]]:
         """
-        Shuffle a list using cryptographically secure random (Fisher-Yates shuffle).
+        Build the character pool for a combination of flags.
 
-        Args:
-            items: List to shuffle in place
+        Returns:
+            A tuple of (pool of all selected characters, one set per selected class)
         """
-        for i in range(len(items) - 1, 0, -1):
-            j = secrets.randbelow(i + 1)
-            items[i], items[j] = items[j], items[i]
+        selected = [charset for charset, include in (
+            (cls.LOWERCASE, include_lowercase),
+            (cls.UPPERCASE, include_uppercase),
+            (cls.DIGITS, include_digits),
+            (cls.SYMBOLS, include_symbols),
+        ) if include]
+        return ''.join(selected), tuple(frozenset(charset) for charset in selected)
 
     @classmethod
     def check_password_strength(cls, password: str) -> Tuple[int, str, List[str]]:
@@ -173,4 +194,44 @@ class PasswordGenerator:
             5: "Very Strong"
         }
 
-        return score, strength_labels[score], suggestions 
\ No newline at end of file
+        return score, strength_labels[score], suggestions 
+
+
+@functools.lru_cache(maxsize=16)
+def _byte_table(char_pool: str) -> Tuple[bytes, bytes]:
+    """
+    Build the bytes.translate() arguments that map random bytes to a pool.
+
+    Bytes at or above the largest multiple of the pool size are deleted
+    rather than wrapped, so every character is equally likely.
+
+    Args:
+        char_pool: ASCII characters to draw from
+
+    Returns:
+        A tuple of (256-byte translation table, bytes to delete)
+    """
+    limit = 256 - 256 % len(char_pool)
+    table = bytes(ord(char_pool[b % len(char_pool)]) for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+def _random_chars(char_pool: str, count: int) -> str:
+    """
+    Draw characters uniformly from a pool using the OS CSPRNG.
+
+    Args:
+        char_pool: ASCII characters to draw from (at most 256)
+        count: Number of characters to draw
+
+    Returns:
+        A string of count random characters
+    """
+    table, rejected = _byte_table(char_pool)
+    # Oversample by the expected rejection rate to usually need one read
+    accept = 256 - len(rejected)
+    chars = bytearray()
+    while len(chars) < count:
+        needed = count - len(chars)
+        chars += secrets.token_bytes(needed * 256 // accept + 8).translate(table, rejected)
+    return chars[:count].decode('ascii')
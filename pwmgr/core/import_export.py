@@ -59,7 +59,7 @@ class DataImporter:
                 try:
                     entry = PasswordEntry.from_dict(entry_dict)
                     entries.append(entry)
-                except (KeyError, TypeError) as e:
+                except (KeyError, TypeError, ValueError):
                     # Skip invalid entries but continue
                     continue
 
@@ -140,7 +140,8 @@ class DataImporter:
             ImportError: If import fails
         """
         try:
-            with open(file_path, 'r') as f:
+            # Accepts both base64 exports and raw backup files
+            with open(file_path, 'rb') as f:
                 encrypted_data = f.read()
 
             json_data = EncryptionService.decrypt_password_data(encrypted_data, master_password)
@@ -257,7 +258,7 @@ class DataExporter:
             }
 
             json_data = json.dumps(data)
-            encrypted_data = EncryptionService.encrypt_password_data(json_data, master_password)
+            encrypted_data = EncryptionService.encrypt_password_data_b64(json_data, master_password)
 
             with open(file_path, 'w') as f:
                 f.write(encrypted_data)
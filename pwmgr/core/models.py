@@ -1,59 +1,88 @@
 """
 Data models for password manager.
 """
-import uuid
-from dataclasses import dataclass, field
-from typing import Optional
+import secrets
+from typing import Optional, Any
 from datetime import datetime
 
+import msgspec
 
-@dataclass
-class PasswordEntry:
+
+def _new_id() -> str:
+    """Generate a new unique entry ID (128 random bits as 32 hex characters)."""
+    return secrets.token_hex(16)
+
+
+def _now_iso() -> str:
+    """Return the current local time as an ISO 8601 string."""
+    return datetime.now().isoformat()
+
+
+def _coerce_str(value: Any) -> Optional[str]:
+    """Return a loosely typed field value as a string, keeping None as None."""
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+class PasswordEntry(msgspec.Struct, gc=False):
     """
     Represents a single password entry in the password manager.
+
+    Entries hold only strings, so they can never be part of a reference
+    cycle and are left untracked by the garbage collector.
     """
     name: str
     username: str
     password: str
     notes: Optional[str] = None
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    
+    id: str = msgspec.field(default_factory=_new_id)
+    created_at: str = msgspec.field(default_factory=_now_iso)
+    updated_at: str = msgspec.field(default_factory=_now_iso)
+
     def to_dict(self) -> dict:
         """
         Convert the password entry to a dictionary.
-        
+
         Returns:
             Dictionary representation of the password entry
         """
-        return {
-            "id": self.id,
-            "name": self.name,
-            "username": self.username,
-            "password": self.password,
-            "notes": self.notes,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
-    
+        return msgspec.to_builtins(self)
+
     @classmethod
     def from_dict(cls, data: dict) -> 'PasswordEntry':
         """
         Create a password entry from a dictionary.
-        
+
+        Missing optional fields get their defaults; unknown keys are ignored.
+        Data from older releases or other password managers may hold nulls
+        or numbers in string fields; those values are coerced to strings,
+        with a null username or password becoming an empty string.
+
         Args:
             data: Dictionary containing password entry data
-            
+
         Returns:
             PasswordEntry object
+
+        Raises:
+            KeyError: If a required field is missing
+            TypeError: If data is not a dictionary
         """
+        try:
+            return msgspec.convert(data, cls)
+        except msgspec.ValidationError:
+            pass
+
+        name = _coerce_str(data["name"])
+        if name is None:
+            raise TypeError("Password entry name must not be null")
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
-            name=data["name"],
-            username=data["username"],
-            password=data["password"],
-            notes=data.get("notes"),
-            created_at=data.get("created_at", datetime.now().isoformat()),
-            updated_at=data.get("updated_at", datetime.now().isoformat())
-        ) 
\ No newline at end of file
+            name=name,
+            username=_coerce_str(data["username"]) or "",
+            password=_coerce_str(data["password"]) or "",
+            notes=_coerce_str(data.get("notes")),
+            id=_coerce_str(data.get("id")) or _new_id(),
+            created_at=_coerce_str(data.get("created_at")) or _now_iso(),
+            updated_at=_coerce_str(data.get("updated_at")) or _now_iso(),
+        )
@@ -3,16 +3,30 @@ Storage module for the password manager.
 Handles reading and writing of encrypted password data.
 """
 import os
-import json
 import stat
 import platform
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import os.path
 
+import msgspec
+
 from ..crypto import EncryptionService
 from .models import PasswordEntry
 
 
+class _Vault(msgspec.Struct):
+    """Top-level layout of the decrypted password file."""
+    entries: List[PasswordEntry] = []
+
+
+_VAULT_ENCODER = msgspec.json.Encoder()
+_VAULT_DECODER = msgspec.json.Decoder(_Vault)
+
+# Page-cache hints (not available on Windows or macOS)
+_FADV_SEQUENTIAL = getattr(os, 'POSIX_FADV_SEQUENTIAL', None)
+_FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
+
+
 class PasswordStorage:
     """
     Handles storage and retrieval of encrypted password entries.
@@ -25,14 +39,28 @@ class PasswordStorage:
     SECURE_FILE_MODE = 0o600
     SECURE_DIR_MODE = 0o700
 
-    def __init__(self, file_path: Optional[str] = None):
+    def __init__(self, file_path: Optional[str] = None, crypto=EncryptionService):
         """
         Initialize the password storage.
 
         Args:
             file_path: Path to the password file. If not provided, uses the default path.
+            crypto: Provider of encrypt_password_data, decrypt_password_data,
+                get_kdf_params and get_salt (default: EncryptionService)
         """
         self.file_path = file_path or self.DEFAULT_FILE_PATH
+        self._crypto = crypto
+        # Argon2id (time_cost, memory_cost, parallelism) of the vault,
+        # carried from load() to save(), or read from the vault header when
+        # save() runs first
+        self.kdf_params: Optional[Tuple[int, int, int]] = None
+        # Salt of the vault as last loaded or saved. Saving with the same salt
+        # lets the key derived on unlock come from EncryptionService's key
+        # cache instead of running Argon2id on every save; the tradeoff is
+        # that the derived key stays in process memory until
+        # EncryptionService.clear_key_cache(). Each save still uses a fresh
+        # random GCM nonce.
+        self._salt: Optional[bytes] = None
         self._ensure_storage_dir_exists()
 
     def _ensure_storage_dir_exists(self) -> None:
@@ -42,24 +70,6 @@ class PasswordStorage:
             os.makedirs(dir_path, exist_ok=True)
             self._set_secure_dir_permissions(dir_path)
 
-    def _set_secure_file_permissions(self, file_path: str) -> None:
-        """
-        Set secure permissions on a file (owner read/write only).
-
-        Args:
-            file_path: Path to the file
-        """
-        # On Windows, file permissions work differently
-        # We still try to set restrictive permissions, but they may not have the same effect
-        try:
-            current_mode = os.stat(file_path).st_mode
-            # Remove all permissions for group and others
-            new_mode = current_mode & (stat.S_IRUSR | stat.S_IWUSR)
-            os.chmod(file_path, new_mode)
-        except OSError:
-            # Silently ignore permission errors on systems that don't support Unix permissions
-            pass
-
     def _set_secure_dir_permissions(self, dir_path: str) -> None:
         """
         Set secure permissions on a directory (owner access only).
@@ -82,19 +92,27 @@ class PasswordStorage:
         Returns:
             Warning message if permissions are insecure, None otherwise
         """
-        if not self.file_exists():
-            return None
-
         try:
             file_stat = os.stat(self.file_path)
-            mode = file_stat.st_mode
-
-            # Check if group or others have any access
-            if mode & (stat.S_IRWXG | stat.S_IRWXO):
-                return (f"Warning: Password file '{self.file_path}' has insecure permissions. "
-                        f"Run: chmod 600 '{self.file_path}'")
         except OSError:
-            pass
+            return None
+
+        return self._check_file_permissions_stat(file_stat)
+
+    def _check_file_permissions_stat(self, file_stat: os.stat_result) -> Optional[str]:
+        """
+        Check if file permissions are secure, given an existing stat result.
+
+        Args:
+            file_stat: Result of os.stat() on the password file
+
+        Returns:
+            Warning message if permissions are insecure, None otherwise
+        """
+        # Check if group or others have any access
+        if file_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            return (f"Warning: Password file '{self.file_path}' has insecure permissions. "
+                    f"Run: chmod 600 '{self.file_path}'")
 
         return None
 
@@ -110,6 +128,43 @@ class PasswordStorage:
                     "Ensure your password file is in a secure location accessible only to your user account.")
         return None
 
+    @staticmethod
+    def _advise(fd: int, advice: Optional[int]) -> None:
+        """
+        Pass an access-pattern hint for an open file to the kernel.
+
+        Args:
+            fd: File descriptor of the open file
+            advice: One of the os.POSIX_FADV_* constants, or None if unsupported
+        """
+        if advice is None:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            # Hints are best-effort; some filesystems reject them
+            pass
+
+    def _create_secure_file(self, file_path: str) -> int:
+        """
+        Create a new file that is owner read/write from the start.
+
+        A file left behind by an interrupted save is removed first, since
+        opening an existing file would keep its old permissions.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            File descriptor open for writing
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        try:
+            return os.open(file_path, flags, self.SECURE_FILE_MODE)
+        except FileExistsError:
+            os.remove(file_path)
+            return os.open(file_path, flags, self.SECURE_FILE_MODE)
+
     def file_exists(self) -> bool:
         """
         Check if the password file exists.
@@ -119,6 +174,20 @@ class PasswordStorage:
         """
         return os.path.exists(self.file_path)
 
+    def _read_kdf_params(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Read the Argon2id parameters from the header of the existing vault.
+
+        Returns:
+            (time_cost, memory_cost, parallelism), or None if there is no vault
+            or it is not in the Argon2id format
+        """
+        try:
+            with open(self.file_path, 'rb') as f:
+                return self._crypto.get_kdf_params(f.read())
+        except FileNotFoundError:
+            return None
+
     def save(self, entries: List[PasswordEntry], master_password: str) -> None:
         """
         Save password entries to file with secure permissions.
@@ -127,37 +196,40 @@ class PasswordStorage:
             entries: List of password entries to save
             master_password: Master password for encryption
         """
-        # Convert entries to dictionary format
-        data = {
-            "entries": [entry.to_dict() for entry in entries]
-        }
-
-        # Encrypt and save
-        json_data = json.dumps(data)
-        encrypted_data = EncryptionService.encrypt_password_data(json_data, master_password)
-
-        # Write to a temporary file first, then rename for atomic operation
+        # Encode entries straight to JSON bytes, without intermediate dicts
+        json_data = _VAULT_ENCODER.encode(_Vault(entries))
+
+        # Encrypt and save, keeping the vault's calibrated KDF cost
+        if self.kdf_params is None:
+            self.kdf_params = self._read_kdf_params()
+        kdf_params = self.kdf_params or (None, None, None)
+        encrypted_data = self._crypto.encrypt_password_data(json_data, master_password, *kdf_params,
+                                                            salt=self._salt)
+        self._salt = self._crypto.get_salt(encrypted_data)
+
+        # Write to a temporary file first, then rename for atomic operation.
+        # (O_TMPFILE + link would avoid the name, but link() can't replace an
+        # existing vault, so os.replace is still needed for the swap.)
         temp_file = self.file_path + '.tmp'
         try:
-            with open(temp_file, 'w') as f:
+            f = os.fdopen(self._create_secure_file(temp_file), 'wb')
+            with f:
                 f.write(encrypted_data)
+                f.flush()
+                os.fsync(f.fileno())
+                # Data is on disk; drop it from the page cache
+                self._advise(f.fileno(), _FADV_DONTNEED)
 
-            # Set secure permissions before moving
-            self._set_secure_file_permissions(temp_file)
-
-            # Atomic rename
+            # Atomic rename; the vault keeps the 0600 mode it was created with
             os.replace(temp_file, self.file_path)
 
-            # Ensure final file has secure permissions
-            self._set_secure_file_permissions(self.file_path)
-
-        finally:
-            # Clean up temp file if it exists
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except OSError:
-                    pass
+        except BaseException:
+            # Clean up the temp file; on success it was renamed away
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
 
     def load(self, master_password: str) -> Optional[List[PasswordEntry]]:
         """
@@ -169,36 +241,55 @@ class PasswordStorage:
         Returns:
             List of password entries or None if decryption fails
         """
-        if not self.file_exists():
+        # A single stat serves both the existence and the permission check
+        try:
+            file_stat = os.stat(self.file_path)
+        except FileNotFoundError:
             return []
 
         # Check file permissions (informational only)
-        permission_warning = self._check_file_permissions()
+        permission_warning = self._check_file_permissions_stat(file_stat)
 
-        with open(self.file_path, 'r') as f:
+        with open(self.file_path, 'rb') as f:
+            # The vault is always read start-to-end
+            self._advise(f.fileno(), _FADV_SEQUENTIAL)
             encrypted_data = f.read()
 
         # Decrypt the data
-        json_data = EncryptionService.decrypt_password_data(encrypted_data, master_password)
+        json_data = self._crypto.decrypt_password_data(encrypted_data, master_password)
         if json_data is None:
             return None
+        self.kdf_params = self._crypto.get_kdf_params(encrypted_data)
+        self._salt = self._crypto.get_salt(encrypted_data)
 
-        # Parse the decrypted data
-        data = json.loads(json_data)
-
-        # Convert dictionaries to PasswordEntry objects
-        entries = [PasswordEntry.from_dict(entry_dict) for entry_dict in data.get("entries", [])]
-
-        return entries
+        # Parse the decrypted data straight into PasswordEntry objects
+        try:
+            return _VAULT_DECODER.decode(json_data).entries
+        except msgspec.ValidationError:
+            # Older releases stored entries without type checks
+            vault = msgspec.json.decode(json_data)
+            return [PasswordEntry.from_dict(entry) for entry in vault.get("entries", [])]
 
-    def initialize(self, master_password: str) -> None:
+    def initialize(self, master_password: str, time_cost: Optional[int] = None) -> None:
         """
         Initialize a new password file with secure permissions.
 
         Args:
             master_password: Master password for encryption
+            time_cost: Argon2id pass count for the vault, e.g. from
+                EncryptionService.calibrate_iterations()
+
+        Raises:
+            ValueError: If time_cost is outside the range the vault header accepts
         """
-        # Create an empty password database
+        # Create an empty password database with a fresh salt; the KDF cost is
+        # set explicitly so an existing vault's header is not carried over
+        self._salt = None
+        self.kdf_params = (
+            EncryptionService.ARGON2_TIME_COST if time_cost is None else time_cost,
+            EncryptionService.ARGON2_MEMORY_COST,
+            EncryptionService.ARGON2_PARALLELISM,
+        )
         self.save([], master_password)
 
         # Set directory permissions as well
@@ -4,36 +4,80 @@ Provides secure encryption and decryption of password data using AES-256-GCM.
 """
 import os
 import base64
+import binascii
+import ctypes
+import hashlib
+import hmac
 import struct
-from typing import Tuple, Optional
-
+import time
+from collections import OrderedDict
+from enum import IntEnum
+from typing import Dict, Tuple, Optional, Union
+
+from argon2.exceptions import HashingError
+from argon2.low_level import Type, hash_secret_raw
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
 
+# cryptography >= 47 can derive and decrypt straight into a caller-owned buffer;
+# without derive_into, PBKDF2 goes through hashlib instead
+_HAS_DERIVE_INTO = hasattr(PBKDF2HMAC, 'derive_into')
+_HAS_DECRYPT_INTO = hasattr(AESGCM, 'decrypt_into')
+
+# Per-process pepper for derived-key cache lookups, so cache keys can't be
+# reversed to the password and never carry over between processes
+_PROCESS_PEPPER = os.urandom(32)
+# (version, KDF params, password fingerprint, salt) -> derived key, least recent first
+_KEY_CACHE: 'OrderedDict[Tuple[int, Tuple[int, ...], bytes, bytes], bytearray]' = OrderedDict()
+# id(cached key) -> (key, AESGCM instance), so the AES key schedule is
+# expanded once per cached key; holding the key keeps its id from being reused
+_AESGCM_CACHE: Dict[int, Tuple[bytearray, AESGCM]] = {}
 
-class EncryptionVersion:
+
+class EncryptionVersion(IntEnum):
     """Encryption version identifiers for backward compatibility."""
     CBC = 1  # Legacy AES-256-CBC (deprecated)
-    GCM = 2  # AES-256-GCM (current)
+    GCM = 2  # AES-256-GCM with PBKDF2-SHA256 keys
+    GCM_ARGON2 = 3  # AES-256-GCM with Argon2id keys (current)
 
 
 class EncryptionService:
     """Handles encryption and decryption of sensitive data using AES-256-GCM."""
 
-    # Number of iterations for PBKDF2
+    # Number of iterations for PBKDF2 (legacy formats)
     ITERATIONS = 100000
+    # Argon2id cost parameters: passes, memory in KiB, lanes. These are the
+    # defaults for new blobs; each blob stores the parameters it was made with
+    ARGON2_TIME_COST = 3
+    ARGON2_MEMORY_COST = 64 * 1024
+    ARGON2_PARALLELISM = 1
+    # Upper bounds accepted from a blob header, a few times the calibrated
+    # range so a tampered header cannot pin the CPU or RAM for long
+    ARGON2_MAX_TIME_COST = 16
+    ARGON2_MAX_MEMORY_COST = 256 * 1024
+    # The header stores the lane count in a single byte
+    ARGON2_MAX_PARALLELISM = 255
     # Salt length in bytes
     SALT_LENGTH = 16
     # Key length in bytes for AES-256
     KEY_LENGTH = 32
     # IV/Nonce length in bytes
     IV_LENGTH = 16
+    # GCM nonce length in bytes (96 bits, as recommended for GCM)
+    GCM_NONCE_LENGTH = 12
     # GCM tag length in bytes
     GCM_TAG_LENGTH = 16
     # Current encryption version
-    CURRENT_VERSION = EncryptionVersion.GCM
+    CURRENT_VERSION = EncryptionVersion.GCM_ARGON2
+    # Number of derived keys kept in memory per process
+    KEY_CACHE_SIZE = 8
+    # AES-256-GCM throughput (MB/s) below which OpenSSL is likely running
+    # without AES-NI, e.g. a build configured with no-asm
+    AES_NI_MIN_MBPS = 500
 
     @staticmethod
     def generate_salt() -> bytes:
@@ -41,52 +85,330 @@ class EncryptionService:
         return os.urandom(EncryptionService.SALT_LENGTH)
 
     @staticmethod
-    def derive_key(master_password: str, salt: bytes) -> bytes:
+    def _wipe(buf: bytearray) -> None:
+        """
+        Overwrite a mutable buffer with zeros.
+
+        Args:
+            buf: The buffer holding key material or plaintext
+        """
+        if buf:
+            ctypes.memset(ctypes.addressof((ctypes.c_char * len(buf)).from_buffer(buf)), 0, len(buf))
+
+    @staticmethod
+    def derive_key(master_password: Union[str, bytes], salt: bytes) -> bytearray:
         """
         Derive an encryption key from the master password and salt.
 
         Args:
-            master_password: The user's master password
+            master_password: The user's master password, as text or UTF-8 bytes
             salt: Random salt for key derivation
 
         Returns:
-            The derived key for encryption/decryption
+            The derived key for encryption/decryption, in a buffer that
+            can be wiped with _wipe() once it is no longer needed
         """
+        if isinstance(master_password, str):
+            master_password = master_password.encode('utf-8')
+        if not _HAS_DERIVE_INTO:
+            # hashlib calls OpenSSL's PBKDF2 directly, without the KDF object
+            return bytearray(hashlib.pbkdf2_hmac(
+                'sha256', master_password, salt, EncryptionService.ITERATIONS,
+                dklen=EncryptionService.KEY_LENGTH,
+            ))
+
+        # derive_into() writes straight into the wipeable buffer, leaving no
+        # immutable copy of the key behind
         kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
+            algorithm=_SHA256,
             length=EncryptionService.KEY_LENGTH,
             salt=salt,
             iterations=EncryptionService.ITERATIONS,
         )
-        return kdf.derive(master_password.encode('utf-8'))
+        key = bytearray(EncryptionService.KEY_LENGTH)
+        kdf.derive_into(master_password, key)
+        return key
+
+    @staticmethod
+    def derive_key_argon2(master_password: Union[str, bytes], salt: bytes, time_cost: Optional[int] = None,
+                          memory_cost: Optional[int] = None, parallelism: Optional[int] = None) -> bytearray:
+        """
+        Derive an encryption key from the master password and salt using Argon2id.
+
+        Args:
+            master_password: The user's master password, as text or UTF-8 bytes
+            salt: Random salt for key derivation
+            time_cost: Number of Argon2 passes (default: ARGON2_TIME_COST)
+            memory_cost: Memory in KiB (default: ARGON2_MEMORY_COST)
+            parallelism: Number of lanes (default: ARGON2_PARALLELISM)
+
+        Returns:
+            The derived key for encryption/decryption, in a buffer that
+            can be wiped with _wipe() once it is no longer needed
+        """
+        if isinstance(master_password, str):
+            master_password = master_password.encode('utf-8')
+        return bytearray(hash_secret_raw(
+            master_password,
+            salt,
+            time_cost=EncryptionService.ARGON2_TIME_COST if time_cost is None else time_cost,
+            memory_cost=EncryptionService.ARGON2_MEMORY_COST if memory_cost is None else memory_cost,
+            parallelism=EncryptionService.ARGON2_PARALLELISM if parallelism is None else parallelism,
+            hash_len=EncryptionService.KEY_LENGTH,
+            type=Type.ID,
+        ))
+
+    @staticmethod
+    def calibrate_iterations(target_ms: int = 250) -> int:
+        """
+        Pick the Argon2id pass count that takes about target_ms on this machine.
+
+        Doubles the pass count from ARGON2_TIME_COST until a derivation takes
+        at least half the target, then scales linearly to the target.
+
+        Args:
+            target_ms: Desired key derivation time in milliseconds
+
+        Returns:
+            The pass count, between ARGON2_TIME_COST and ARGON2_MAX_TIME_COST
+        """
+        salt = EncryptionService.generate_salt()
+        time_cost = EncryptionService.ARGON2_TIME_COST
+
+        while True:
+            start = time.perf_counter()
+            EncryptionService._wipe(EncryptionService.derive_key_argon2("x" * 16, salt, time_cost))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms >= target_ms / 2 or time_cost >= EncryptionService.ARGON2_MAX_TIME_COST:
+                break
+            time_cost *= 2
+
+        # Argon2 run time is linear in the number of passes
+        time_cost = int(time_cost * target_ms / max(elapsed_ms, 1e-3))
+        return max(EncryptionService.ARGON2_TIME_COST, min(time_cost, EncryptionService.ARGON2_MAX_TIME_COST))
+
+    @staticmethod
+    def self_test_hardware(size_mb: int = 10) -> dict:
+        """
+        Measure AES-256-GCM throughput to check that OpenSSL uses AES-NI.
+
+        Args:
+            size_mb: Amount of data to encrypt, in 1 MB chunks
+
+        Returns:
+            Dictionary with the measured "aes_gcm_mbps" and whether it meets
+            AES_NI_MIN_MBPS ("accelerated")
+        """
+        aesgcm = AESGCM(os.urandom(EncryptionService.KEY_LENGTH))
+        chunk = bytes(1024 * 1024)
+        nonces = [os.urandom(EncryptionService.GCM_NONCE_LENGTH) for _ in range(size_mb)]
+
+        start = time.perf_counter()
+        for nonce in nonces:
+            aesgcm.encrypt(nonce, chunk, None)
+        elapsed = time.perf_counter() - start
+
+        mbps = size_mb / max(elapsed, 1e-9)
+        return {
+            "aes_gcm_mbps": round(mbps, 1),
+            "accelerated": mbps >= EncryptionService.AES_NI_MIN_MBPS,
+        }
+
+    @staticmethod
+    def _decode_blob(encrypted_data: bytes) -> bytes:
+        """
+        Return the raw blob, decoding the base64 text older vaults were stored as.
+
+        Every versioned blob starts with a small version byte, which never
+        occurs in base64 text, so the two encodings can't be confused.
+
+        Args:
+            encrypted_data: Raw blob bytes or legacy base64 text
+
+        Returns:
+            The raw blob
+        """
+        if encrypted_data[:1] and encrypted_data[0] in _VERSION_HANDLERS:
+            return encrypted_data
+        return base64.b64decode(encrypted_data)
+
+    @staticmethod
+    def get_kdf_params(encrypted_data: bytes) -> Optional[Tuple[int, int, int]]:
+        """
+        Read the Argon2id parameters from an encrypted blob's header.
+
+        Args:
+            encrypted_data: The encrypted password data
+
+        Returns:
+            (time_cost, memory_cost, parallelism), or None if the blob is not
+            in the Argon2id format
+        """
+        try:
+            decoded = EncryptionService._decode_blob(encrypted_data)
+            if decoded[0] != EncryptionVersion.GCM_ARGON2:
+                return None
+            return _ARGON2_PARAMS.unpack_from(decoded, 1)
+        except (ValueError, IndexError, struct.error):
+            return None
 
     @staticmethod
-    def _encrypt_gcm(data: str, key: bytes) -> Tuple[bytes, bytes, bytes]:
+    def get_salt(encrypted_data: bytes) -> Optional[bytes]:
+        """
+        Read the KDF salt from an encrypted blob's header.
+
+        Args:
+            encrypted_data: The encrypted password data
+
+        Returns:
+            The salt, or None if the blob is not in the Argon2id format
+        """
+        try:
+            decoded = EncryptionService._decode_blob(encrypted_data)
+        except ValueError:
+            return None
+        if len(decoded) < _ARGON2_SALT_END or decoded[0] != EncryptionVersion.GCM_ARGON2:
+            return None
+        return bytes(decoded[_ARGON2_SALT_START:_ARGON2_SALT_END])
+
+    @staticmethod
+    def _derive_key_cached(version: int, master_password: bytes, salt: bytes,
+                           params: Tuple[int, ...] = ()) -> bytearray:
+        """
+        Derive the key for a blob version, reusing it if it was derived recently.
+
+        The returned buffer belongs to the cache and must not be wiped by the
+        caller; use clear_key_cache() to drop all cached keys.
+
+        Args:
+            version: The blob's encryption version, which selects the KDF
+            master_password: The user's master password as UTF-8 bytes
+            salt: Random salt for key derivation
+            params: KDF cost parameters stored in the blob header, if any
+
+        Returns:
+            The derived key for encryption/decryption
+        """
+        fingerprint = hmac.new(_PROCESS_PEPPER, master_password, hashlib.sha256).digest()
+        cache_key = (version, params, fingerprint, bytes(salt))
+
+        key = _KEY_CACHE.get(cache_key)
+        if key is not None:
+            _KEY_CACHE.move_to_end(cache_key)
+            return key
+
+        if version == EncryptionVersion.GCM_ARGON2:
+            key = EncryptionService.derive_key_argon2(master_password, salt, *params)
+        else:
+            key = EncryptionService.derive_key(master_password, salt)
+
+        _KEY_CACHE[cache_key] = key
+        if len(_KEY_CACHE) > EncryptionService.KEY_CACHE_SIZE:
+            _, evicted = _KEY_CACHE.popitem(last=False)
+            _AESGCM_CACHE.pop(id(evicted), None)
+            EncryptionService._wipe(evicted)
+        return key
+
+    @staticmethod
+    def clear_key_cache() -> None:
+        """Wipe and forget all cached derived keys (call on lock/logout)."""
+        _AESGCM_CACHE.clear()
+        while _KEY_CACHE:
+            _, key = _KEY_CACHE.popitem()
+            EncryptionService._wipe(key)
+
+    @staticmethod
+    def _get_aesgcm(key: bytes) -> AESGCM:
+        """
+        Return an AESGCM instance for a key, reusing it for cached keys.
+
+        Only keys owned by the derived-key cache are memoized, so the
+        instances are dropped together with their keys.
+
+        Args:
+            key: The encryption key
+
+        Returns:
+            An AESGCM instance for the key
+        """
+        entry = _AESGCM_CACHE.get(id(key))
+        if entry is not None and entry[0] is key:
+            return entry[1]
+
+        aesgcm = AESGCM(key)
+        if any(cached is key for cached in _KEY_CACHE.values()):
+            _AESGCM_CACHE[id(key)] = (key, aesgcm)
+        return aesgcm
+
+    @staticmethod
+    def _encrypt_gcm(data: str, key: bytes, nonce: Optional[bytes] = None) -> Tuple[bytes, bytes, bytes]:
         """
         Encrypt data using AES-256-GCM.
 
         Args:
             data: The plaintext data to encrypt
             key: The encryption key
+            nonce: A fresh random 12-byte nonce (default: generated here)
 
         Returns:
             A tuple of (nonce, ciphertext, tag)
         """
         # Generate a random nonce (12 bytes is recommended for GCM)
-        nonce = os.urandom(12)
+        if nonce is None:
+            nonce = os.urandom(EncryptionService.GCM_NONCE_LENGTH)
 
-        # Create the cipher
-        cipher = Cipher(algorithms.AES(key), modes.GCM(nonce), backend=default_backend())
-        encryptor = cipher.encryptor()
-
-        # Encrypt the data (GCM doesn't need padding)
-        ciphertext = encryptor.update(data.encode('utf-8')) + encryptor.finalize()
+        # One-shot AEAD call; GCM needs no padding and the tag is appended
+        plaintext = bytearray(data, 'utf-8')
+        try:
+            sealed = EncryptionService._get_aesgcm(key).encrypt(nonce, plaintext, None)
+        finally:
+            EncryptionService._wipe(plaintext)
 
-        # Get the authentication tag
-        tag = encryptor.tag
+        ciphertext = sealed[:-EncryptionService.GCM_TAG_LENGTH]
+        tag = sealed[-EncryptionService.GCM_TAG_LENGTH:]
 
         return nonce, ciphertext, tag
 
+    @staticmethod
+    def _seal_gcm(data: Union[str, bytes], key: bytes, header: bytes, nonce: Optional[bytes] = None) -> bytearray:
+        """
+        Encrypt data using AES-256-GCM directly into a complete storage blob.
+
+        The ciphertext is written in place behind the header, so the blob is
+        allocated once instead of being concatenated from its parts.
+
+        Args:
+            data: The plaintext data to encrypt, as text or UTF-8 bytes
+            key: The encryption key
+            header: Version byte, KDF parameters and salt
+            nonce: A fresh random 12-byte nonce (default: generated here)
+
+        Returns:
+            header + nonce(12) + tag(16) + ciphertext
+        """
+        if nonce is None:
+            nonce = os.urandom(EncryptionService.GCM_NONCE_LENGTH)
+        plaintext = bytearray(data, 'utf-8') if isinstance(data, str) else bytearray(data)
+        nonce_end = len(header) + EncryptionService.GCM_NONCE_LENGTH
+        tag_end = nonce_end + EncryptionService.GCM_TAG_LENGTH
+
+        # update_into() needs a block's worth of slack past the output
+        blob = bytearray(tag_end + len(plaintext) + _UPDATE_INTO_SLACK)
+        blob[:len(header)] = header
+        blob[len(header):nonce_end] = nonce
+
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce), backend=default_backend()).encryptor()
+        try:
+            with memoryview(blob) as view:
+                encryptor.update_into(plaintext, view[tag_end:])
+            encryptor.finalize()
+        finally:
+            EncryptionService._wipe(plaintext)
+
+        blob[nonce_end:tag_end] = encryptor.tag
+        del blob[len(blob) - _UPDATE_INTO_SLACK:]
+        return blob
+
     @staticmethod
     def _decrypt_gcm(nonce: bytes, ciphertext: bytes, tag: bytes, key: bytes) -> str:
         """
@@ -102,16 +424,19 @@ class EncryptionService:
             The decrypted plaintext
 
         Raises:
-            ValueError: If authentication fails
+            InvalidTag: If authentication fails
         """
-        # Create the cipher with the tag
-        cipher = Cipher(algorithms.AES(key), modes.GCM(nonce, tag), backend=default_backend())
-        decryptor = cipher.decryptor()
+        aesgcm = EncryptionService._get_aesgcm(key)
+        if not _HAS_DECRYPT_INTO:
+            return aesgcm.decrypt(nonce, ciphertext + tag, None).decode('utf-8')
 
-        # Decrypt the data
-        data = decryptor.update(ciphertext) + decryptor.finalize()
-
-        return data.decode('utf-8')
+        # Decrypt into a buffer we own so the plaintext bytes can be wiped
+        buf = bytearray(len(ciphertext))
+        try:
+            aesgcm.decrypt_into(nonce, ciphertext + tag, None, buf)
+            return buf.decode('utf-8')
+        finally:
+            EncryptionService._wipe(buf)
 
     @staticmethod
     def _encrypt_cbc(data: str, key: bytes) -> Tuple[bytes, bytes]:
@@ -128,16 +453,20 @@ class EncryptionService:
         # Generate a random IV
         iv = os.urandom(EncryptionService.IV_LENGTH)
 
-        # Pad the data
-        padder = padding.PKCS7(algorithms.AES.block_size).padder()
-        padded_data = padder.update(data.encode('utf-8')) + padder.finalize()
+        # Pad the data (PKCS7) in a mutable buffer so it can be wiped afterwards
+        padded_data = bytearray(data, 'utf-8')
+        pad_length = _AES_BLOCK_BYTES - len(padded_data) % _AES_BLOCK_BYTES
+        padded_data.extend(bytes((pad_length,)) * pad_length)
 
         # Create the cipher
         cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
         encryptor = cipher.encryptor()
 
         # Encrypt the data
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
+        try:
+            ciphertext = encryptor.update(padded_data) + encryptor.finalize()
+        finally:
+            EncryptionService._wipe(padded_data)
 
         return iv, ciphertext
 
@@ -162,7 +491,7 @@ class EncryptionService:
         padded_data = decryptor.update(ciphertext) + decryptor.finalize()
 
         # Unpad the data
-        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        unpadder = padding.PKCS7(_AES_BLOCK_SIZE).unpadder()
         data = unpadder.update(padded_data) + unpadder.finalize()
 
         return data.decode('utf-8')
@@ -198,31 +527,74 @@ class EncryptionService:
         return EncryptionService._decrypt_gcm(nonce, ciphertext, tag, key)
 
     @staticmethod
-    def encrypt_password_data(data: str, master_password: str) -> str:
+    def _check_argon2_params(time_cost: int, memory_cost: int, parallelism: int) -> None:
+        """
+        Check Argon2id parameters against the bounds accepted in a blob header.
+
+        Args:
+            time_cost: Number of Argon2 passes
+            memory_cost: Memory in KiB
+            parallelism: Number of lanes
+
+        Raises:
+            ValueError: If a parameter is out of range or Argon2 would reject it
+        """
+        if (not 1 <= time_cost <= EncryptionService.ARGON2_MAX_TIME_COST
+                or not 1 <= parallelism <= EncryptionService.ARGON2_MAX_PARALLELISM
+                or not 8 * parallelism <= memory_cost <= EncryptionService.ARGON2_MAX_MEMORY_COST):
+            raise ValueError("Argon2 parameters out of range")
+
+    @staticmethod
+    def encrypt_password_data(data: Union[str, bytes], master_password: str, time_cost: Optional[int] = None,
+                              memory_cost: Optional[int] = None, parallelism: Optional[int] = None,
+                              salt: Optional[bytes] = None) -> bytes:
         """
         Encrypt password data with the master password using AES-256-GCM.
 
         Args:
-            data: The password data to encrypt
+            data: The password data to encrypt, as text or UTF-8 bytes
             master_password: The user's master password
+            time_cost: Argon2id pass count, e.g. from calibrate_iterations()
+                (default: ARGON2_TIME_COST)
+            memory_cost: Argon2id memory in KiB (default: ARGON2_MEMORY_COST)
+            parallelism: Argon2id lanes (default: ARGON2_PARALLELISM)
+            salt: KDF salt to reuse, e.g. from get_salt() on the blob being
+                replaced, so a cached key can be used (default: a fresh salt)
 
         Returns:
-            Encoded string with version, salt, nonce, tag, and ciphertext
+            Raw blob with version, KDF parameters, salt, nonce, tag, and ciphertext
+
+        Raises:
+            ValueError: If the Argon2id parameters are outside the range that
+                decryption accepts
         """
-        salt = EncryptionService.generate_salt()
-        key = EncryptionService.derive_key(master_password, salt)
-        nonce, ciphertext, tag = EncryptionService._encrypt_gcm(data, key)
+        params = (
+            EncryptionService.ARGON2_TIME_COST if time_cost is None else time_cost,
+            EncryptionService.ARGON2_MEMORY_COST if memory_cost is None else memory_cost,
+            EncryptionService.ARGON2_PARALLELISM if parallelism is None else parallelism,
+        )
+        # Never write a blob that decryption would refuse
+        EncryptionService._check_argon2_params(*params)
+        if salt is None:
+            # One getrandom() call covers both the salt and the nonce
+            random_bytes = os.urandom(EncryptionService.SALT_LENGTH + EncryptionService.GCM_NONCE_LENGTH)
+            salt = random_bytes[:EncryptionService.SALT_LENGTH]
+            nonce = random_bytes[EncryptionService.SALT_LENGTH:]
+        else:
+            nonce = os.urandom(EncryptionService.GCM_NONCE_LENGTH)
+        key = EncryptionService._derive_key_cached(
+            EncryptionService.CURRENT_VERSION, master_password.encode('utf-8'), salt, params
+        )
 
-        # Combine version (1 byte) + salt + nonce + tag + ciphertext for storage
-        version_byte = struct.pack('B', EncryptionService.CURRENT_VERSION)
-        combined = version_byte + salt + nonce + tag + ciphertext
-        return base64.b64encode(combined).decode('utf-8')
+        header = struct.pack('B', EncryptionService.CURRENT_VERSION) + _ARGON2_PARAMS.pack(*params) + salt
+        return bytes(EncryptionService._seal_gcm(data, key, header, nonce))
 
     @staticmethod
-    def decrypt_password_data(encrypted_data: str, master_password: str) -> Optional[str]:
+    def decrypt_password_data(encrypted_data: bytes, master_password: str) -> Optional[str]:
         """
         Decrypt password data with the master password.
-        Supports both GCM (v2) and legacy CBC (v1) formats for backward compatibility.
+        Supports GCM with Argon2id (v3) plus the GCM (v2) and legacy CBC (v1)
+        formats for backward compatibility, stored raw or as base64 text.
 
         Args:
             encrypted_data: The encrypted password data
@@ -232,67 +604,211 @@ class EncryptionService:
             The decrypted password data or None if decryption fails
         """
         try:
-            # Decode the combined data
-            decoded = base64.b64decode(encrypted_data.encode('utf-8'))
+            decoded = EncryptionService._decode_blob(encrypted_data)
+            password = master_password.encode('utf-8')
 
-            # Check if data has version prefix (new format)
-            if len(decoded) < 1:
+            # Reject truncated blobs before paying for key derivation
+            if not decoded or len(decoded) < _MIN_BLOB_LENGTH.get(decoded[0], _MIN_UNVERSIONED_LENGTH):
                 return None
 
-            version = struct.unpack('B', decoded[:1])[0]
-
-            if version == EncryptionVersion.GCM:
-                # GCM format: version(1) + salt(16) + nonce(12) + tag(16) + ciphertext
-                salt = decoded[1:1 + EncryptionService.SALT_LENGTH]
-                nonce = decoded[1 + EncryptionService.SALT_LENGTH:1 + EncryptionService.SALT_LENGTH + 12]
-                tag = decoded[1 + EncryptionService.SALT_LENGTH + 12:1 + EncryptionService.SALT_LENGTH + 12 + EncryptionService.GCM_TAG_LENGTH]
-                ciphertext = decoded[1 + EncryptionService.SALT_LENGTH + 12 + EncryptionService.GCM_TAG_LENGTH:]
-
-                # Derive the key and decrypt
-                key = EncryptionService.derive_key(master_password, salt)
-                return EncryptionService._decrypt_gcm(nonce, ciphertext, tag, key)
-
-            elif version == EncryptionVersion.CBC:
-                # Legacy CBC format: version(1) + salt(16) + iv(16) + ciphertext
-                salt = decoded[1:1 + EncryptionService.SALT_LENGTH]
-                iv = decoded[1 + EncryptionService.SALT_LENGTH:1 + EncryptionService.SALT_LENGTH + EncryptionService.IV_LENGTH]
-                ciphertext = decoded[1 + EncryptionService.SALT_LENGTH + EncryptionService.IV_LENGTH:]
-
-                # Derive the key and decrypt
-                key = EncryptionService.derive_key(master_password, salt)
-                return EncryptionService._decrypt_cbc(iv, ciphertext, key)
-
-            else:
-                # Unknown version, try legacy format (without version prefix)
-                # Old format: salt(16) + iv(16) + ciphertext
-                salt = decoded[:EncryptionService.SALT_LENGTH]
-                iv = decoded[EncryptionService.SALT_LENGTH:EncryptionService.SALT_LENGTH + EncryptionService.IV_LENGTH]
-                ciphertext = decoded[EncryptionService.SALT_LENGTH + EncryptionService.IV_LENGTH:]
-
-                # Derive the key and decrypt
-                key = EncryptionService.derive_key(master_password, salt)
-                return EncryptionService._decrypt_cbc(iv, ciphertext, key)
-
-        except Exception:
+            # Fast path: everything we write is in the current format
+            if decoded[0] == EncryptionVersion.GCM_ARGON2:
+                return EncryptionService._decrypt_gcm_argon2_payload(decoded, password)
+
+            # Dispatch older formats on the version prefix; anything unknown
+            # is the unversioned legacy format
+            handler = _VERSION_HANDLERS.get(decoded[0], EncryptionService._decrypt_unversioned)
+            return handler(decoded, password)
+
+        except (InvalidTag, ValueError, binascii.Error, struct.error, HashingError):
             # Return None if decryption fails (e.g., wrong password)
             return None
 
     @staticmethod
-    def migrate_to_gcm(encrypted_data: str, master_password: str) -> Optional[str]:
+    def encrypt_password_data_b64(data: str, master_password: str) -> str:
+        """
+        Encrypt password data into base64 text, for files meant to be copied by hand.
+
+        Args:
+            data: The password data to encrypt
+            master_password: The user's master password
+
+        Returns:
+            The encrypted blob as base64 text
+        """
+        return base64.b64encode(EncryptionService.encrypt_password_data(data, master_password)).decode('ascii')
+
+    @staticmethod
+    def decrypt_password_data_b64(encrypted_data: str, master_password: str) -> Optional[str]:
+        """
+        Decrypt password data stored as base64 text.
+
+        Args:
+            encrypted_data: The encrypted blob as base64 text
+            master_password: The user's master password
+
+        Returns:
+            The decrypted password data or None if decryption fails
+        """
+        try:
+            decoded = base64.b64decode(encrypted_data.encode('ascii'))
+        except ValueError:
+            return None
+        return EncryptionService.decrypt_password_data(decoded, master_password)
+
+    @staticmethod
+    def _decrypt_gcm_blob(decoded: bytes, key: bytearray, header_end: int) -> str:
         """
-        Migrate legacy CBC encrypted data to GCM format.
+        Decrypt a GCM blob: header + nonce(12) + tag(16) + ciphertext.
+
+        Args:
+            decoded: The raw decoded blob including the version byte
+            key: The key derived from the blob's salt
+            header_end: Offset of the nonce, just past the salt
+
+        Returns:
+            The decrypted plaintext
+        """
+        nonce_end = header_end + EncryptionService.GCM_NONCE_LENGTH
+        tag_end = nonce_end + EncryptionService.GCM_TAG_LENGTH
+
+        nonce = decoded[header_end:nonce_end]
+        tag = decoded[nonce_end:tag_end]
+        ciphertext = decoded[tag_end:]
+
+        return EncryptionService._decrypt_gcm(nonce, ciphertext, tag, key)
+
+    @staticmethod
+    def _decrypt_gcm_payload(decoded: bytes, master_password: bytes) -> str:
+        """
+        Decrypt a GCM blob whose key was derived with PBKDF2 (v2).
+
+        Args:
+            decoded: The raw decoded blob including the version byte
+            master_password: The user's master password as UTF-8 bytes
+
+        Returns:
+            The decrypted plaintext
+        """
+        key = EncryptionService._derive_key_cached(EncryptionVersion.GCM, master_password, decoded[1:_SALT_END])
+        return EncryptionService._decrypt_gcm_blob(decoded, key, _SALT_END)
+
+    @staticmethod
+    def _decrypt_gcm_argon2_payload(decoded: bytes, master_password: bytes) -> str:
+        """
+        Decrypt a GCM blob whose key was derived with Argon2id (v3):
+        version(1) + time_cost(4) + memory_cost(4) + parallelism(1) + salt(16)
+        + nonce(12) + tag(16) + ciphertext.
+
+        Args:
+            decoded: The raw decoded blob including the version byte
+            master_password: The user's master password as UTF-8 bytes
+
+        Returns:
+            The decrypted plaintext
+        """
+        # Refuse parameters that would make a tampered header a memory/CPU bomb
+        params = _ARGON2_PARAMS.unpack_from(decoded, 1)
+        EncryptionService._check_argon2_params(*params)
+
+        salt = decoded[_ARGON2_SALT_START:_ARGON2_SALT_END]
+        key = EncryptionService._derive_key_cached(EncryptionVersion.GCM_ARGON2, master_password, salt, params)
+        return EncryptionService._decrypt_gcm_blob(decoded, key, _ARGON2_SALT_END)
+
+    @staticmethod
+    def _decrypt_cbc_payload(decoded: bytes, master_password: bytes) -> str:
+        """
+        Decrypt a legacy CBC blob: version(1) + salt(16) + iv(16) + ciphertext.
+
+        Args:
+            decoded: The raw decoded blob including the version byte
+            master_password: The user's master password as UTF-8 bytes
+
+        Returns:
+            The decrypted plaintext
+        """
+        salt = decoded[1:_SALT_END]
+        iv = decoded[_SALT_END:_CBC_IV_END]
+        ciphertext = decoded[_CBC_IV_END:]
+
+        key = EncryptionService._derive_key_cached(EncryptionVersion.CBC, master_password, salt)
+        return EncryptionService._decrypt_cbc(iv, ciphertext, key)
+
+    @staticmethod
+    def _decrypt_unversioned(decoded: bytes, master_password: bytes) -> str:
+        """
+        Decrypt the original unversioned format: salt(16) + iv(16) + ciphertext.
+
+        Args:
+            decoded: The raw decoded blob
+            master_password: The user's master password as UTF-8 bytes
+
+        Returns:
+            The decrypted plaintext
+        """
+        salt = decoded[:EncryptionService.SALT_LENGTH]
+        iv = decoded[EncryptionService.SALT_LENGTH:_UNVERSIONED_IV_END]
+        ciphertext = decoded[_UNVERSIONED_IV_END:]
+
+        key = EncryptionService._derive_key_cached(EncryptionVersion.CBC, master_password, salt)
+        return EncryptionService._decrypt_cbc(iv, ciphertext, key)
+
+    @staticmethod
+    def migrate_to_gcm(encrypted_data: bytes, master_password: str) -> Optional[bytes]:
+        """
+        Migrate legacy encrypted data to the current GCM format.
 
         Args:
             encrypted_data: The legacy encrypted password data
             master_password: The user's master password
 
         Returns:
-            Re-encrypted data in GCM format, or None if migration fails
+            Re-encrypted data in the current format, or None if migration fails
         """
         # Decrypt using the backward-compatible method
         decrypted = EncryptionService.decrypt_password_data(encrypted_data, master_password)
         if decrypted is None:
             return None
 
+        # Blobs already in the current format need no second KDF pass
+        decoded = EncryptionService._decode_blob(encrypted_data)
+        if decoded[0] == EncryptionService.CURRENT_VERSION:
+            return decoded
+
         # Re-encrypt with GCM
-        return EncryptionService.encrypt_password_data(decrypted, master_password)
\ No newline at end of file
+        return EncryptionService.encrypt_password_data(decrypted, master_password)
+
+
+# Argon2id parameters stored after the version byte:
+# time_cost (uint32), memory_cost in KiB (uint32), parallelism (uint8)
+_ARGON2_PARAMS = struct.Struct('>IIB')
+
+# Blob offsets, computed once rather than on every decrypt
+_SALT_END = 1 + EncryptionService.SALT_LENGTH
+_ARGON2_SALT_START = 1 + _ARGON2_PARAMS.size
+_ARGON2_SALT_END = _ARGON2_SALT_START + EncryptionService.SALT_LENGTH
+_CBC_IV_END = _SALT_END + EncryptionService.IV_LENGTH
+_UNVERSIONED_IV_END = EncryptionService.SALT_LENGTH + EncryptionService.IV_LENGTH
+
+# Shortest well-formed blob per version: header plus the GCM tag or one CBC block
+_MIN_BLOB_LENGTH = {
+    EncryptionVersion.GCM_ARGON2: _ARGON2_SALT_END + EncryptionService.GCM_NONCE_LENGTH + EncryptionService.GCM_TAG_LENGTH,
+    EncryptionVersion.GCM: _SALT_END + EncryptionService.GCM_NONCE_LENGTH + EncryptionService.GCM_TAG_LENGTH,
+    EncryptionVersion.CBC: _CBC_IV_END + EncryptionService.IV_LENGTH,
+}
+_MIN_UNVERSIONED_LENGTH = _UNVERSIONED_IV_END + EncryptionService.IV_LENGTH
+
+# Algorithm objects looked up once instead of on every call
+_SHA256 = hashes.SHA256()
+_AES_BLOCK_SIZE = algorithms.AES.block_size
+_AES_BLOCK_BYTES = _AES_BLOCK_SIZE // 8
+
+# Extra output room CipherContext.update_into() requires (block size - 1)
+_UPDATE_INTO_SLACK = _AES_BLOCK_BYTES - 1
+
+# Decrypt handler per version byte
+_VERSION_HANDLERS = {
+    EncryptionVersion.GCM_ARGON2: EncryptionService._decrypt_gcm_argon2_payload,
+    EncryptionVersion.GCM: EncryptionService._decrypt_gcm_payload,
+    EncryptionVersion.CBC: EncryptionService._decrypt_cbc_payload,
+}
@@ -1,6 +1,11 @@
 """
 Custom exceptions for the password manager.
 """
+import functools
+
+
+# Field and operation names come from a small vocabulary
+_upper = functools.lru_cache(maxsize=64)(str.upper)
 
 
 class PassMgrError(Exception):
@@ -12,9 +17,8 @@ class PassMgrError(Exception):
         super().__init__(self.message)
 
     def __str__(self):
-        if self.code:
-            return f"[{self.code}] {self.message}"
-        return self.message
+        # code always has a value, see __init__
+        return f"[{self.code}] {self.message}"
 
 
 class ValidationError(PassMgrError):
@@ -22,7 +26,7 @@ class ValidationError(PassMgrError):
 
     def __init__(self, message: str, field: str = None):
         self.field = field
-        code = f"VALIDATION_ERROR{f'_{field.upper()}' if field else ''}"
+        code = "VALIDATION_ERROR_" + _upper(field) if field else "VALIDATION_ERROR"
         super().__init__(message, code)
 
 
@@ -45,7 +49,7 @@ class StorageError(PassMgrError):
 
     def __init__(self, message: str, operation: str = None):
         self.operation = operation
-        code = f"STORAGE_ERROR{f'_{operation.upper()}' if operation else ''}"
+        code = "STORAGE_ERROR_" + _upper(operation) if operation else "STORAGE_ERROR"
         super().__init__(message, code)
 
 
@@ -77,5 +81,5 @@ class BackupError(PassMgrError):
 
     def __init__(self, message: str, operation: str = None):
         self.operation = operation
-        code = f"BACKUP_ERROR{f'_{operation.upper()}' if operation else ''}"
+        code = "BACKUP_ERROR_" + _upper(operation) if operation else "BACKUP_ERROR"
         super().__init__(message, code)
@@ -3,44 +3,144 @@ Logging configuration for the password manager.
 Provides audit logging and sensitive data sanitization.
 """
 import os
+import re
+import copy
+import queue
+import atexit
 import logging
+import logging.handlers
 import json
+import struct
+import functools
 from datetime import datetime
-from typing import Optional, Any
+from typing import Optional, Any, Iterator
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
 
 # Sensitive field names that should be redacted in logs
-SENSITIVE_FIELDS = {'password', 'master_password', 'secret', 'token', 'key', 'credential'}
+SENSITIVE_FIELDS = frozenset({'password', 'master_password', 'secret', 'token', 'key', 'credential'})
+
+REDACTED = '***REDACTED***'
+
+# Matches a sensitive field name anywhere in a string
+_SENSITIVE_RE = re.compile('|'.join(sorted(SENSITIVE_FIELDS)), re.IGNORECASE)
+
+
+# Log records reuse a handful of detail keys, so remember the verdict per key
+@functools.lru_cache(maxsize=256)
+def _is_sensitive_key(key: str) -> bool:
+    """
+    Check whether a dictionary key names a sensitive field.
+
+    Args:
+        key: Dictionary key
+
+    Returns:
+        True if the value stored under the key should be redacted
+    """
+    return key.lower() in SENSITIVE_FIELDS
 
 
 def sanitize_data(data: Any) -> Any:
     """
     Sanitize sensitive data for logging.
 
+    Nested dicts and lists are walked with an explicit stack rather than
+    recursion; each one is copied into its parent slot before its own
+    children are visited. A container reached twice (including through a
+    cycle) maps to the same copy.
+
     Args:
         data: Data to sanitize
 
     Returns:
         Sanitized copy of data with sensitive fields redacted
     """
-    if isinstance(data, dict):
-        return {
-            key: '***REDACTED***' if key.lower() in SENSITIVE_FIELDS else sanitize_data(value)
-            for key, value in data.items()
-        }
-    elif isinstance(data, list):
-        return [sanitize_data(item) for item in data]
-    elif isinstance(data, str):
-        # Check if the string looks like it might contain sensitive data
-        lower_data = data.lower()
-        for field in SENSITIVE_FIELDS:
-            if field in lower_data and ':' in data:
-                # Potential key:value pair, redact the value
-                return '***REDACTED***'
-        return data
-    else:
-        return data
+    root = [data]
+    stack = [(root, 0)]
+    copies = {}
+    while stack:
+        container, slot = stack.pop()
+        value = container[slot]
+        if isinstance(value, (dict, list)) and id(value) in copies:
+            container[slot] = copies[id(value)]
+        elif isinstance(value, dict):
+            sanitized = {}
+            copies[id(value)] = sanitized
+            for key, item in value.items():
+                if _is_sensitive_key(key):
+                    sanitized[key] = REDACTED
+                else:
+                    sanitized[key] = item
+                    stack.append((sanitized, key))
+            container[slot] = sanitized
+        elif isinstance(value, list):
+            sanitized = list(value)
+            copies[id(value)] = sanitized
+            container[slot] = sanitized
+            stack.extend((sanitized, index) for index in range(len(sanitized)))
+        elif isinstance(value, str):
+            # Potential key:value pair, redact the whole string
+            if ':' in value and _SENSITIVE_RE.search(value):
+                container[slot] = REDACTED
+    return root[0]
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact JSON, using orjson when it is installed.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+class _LazyJson:
+    """Defers sanitizing and JSON-encoding audit details until emission."""
+
+    __slots__ = ('obj',)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self):
+        return _dumps(sanitize_data(self.obj)).decode('utf-8')
+
+
+def _sanitize_record(record: logging.LogRecord) -> None:
+    """
+    Sanitize a record's arguments in place, at most once per record.
+
+    Args:
+        record: Log record about to be emitted
+    """
+    if record.args and not getattr(record, 'sanitized', False):
+        record.args = sanitize_data(record.args)
+        record.sanitized = True
+
+
+class SanitizeFilter(logging.Filter):
+    """
+    Handler filter that sanitizes record arguments.
+
+    Handler filters only run for records at or above the handler's level,
+    so records that no handler emits are never sanitized.
+    """
+
+    def filter(self, record):
+        _sanitize_record(record)
+        return True
 
 
 class AuditLogFormatter(logging.Formatter):
@@ -48,11 +148,94 @@ class AuditLogFormatter(logging.Formatter):
 
     def format(self, record):
         # Sanitize the message if it contains arguments
-        if record.args:
-            record.args = sanitize_data(record.args)
+        _sanitize_record(record)
         return super().format(record)
 
 
+def _is_audit_record(record: logging.LogRecord) -> bool:
+    """Return True for records produced by PassMgrLogger.audit()."""
+    return hasattr(record, 'audit_action')
+
+
+def _is_not_audit_record(record: logging.LogRecord) -> bool:
+    """Return True for records not produced by PassMgrLogger.audit()."""
+    return not hasattr(record, 'audit_action')
+
+
+class AuditBinaryHandler(logging.FileHandler):
+    """
+    Append-only audit log of length-prefixed JSON frames.
+
+    Each frame is a 4-byte little-endian payload length followed by a JSON
+    object with the record time, the action and the sanitized details.
+    Use read_audit_log() to read it back.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename, mode='ab')
+
+    def emit(self, record):
+        try:
+            payload = _dumps({
+                "time": record.created,
+                "action": record.audit_action,
+                "details": sanitize_data(record.audit_details),
+            })
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(_FRAME_LENGTH.pack(len(payload)) + payload)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def read_audit_log(path: str) -> Iterator[dict]:
+    """
+    Read the entries of a binary audit log, oldest first.
+
+    A frame cut short by a crash mid-write ends the log; a complete frame
+    whose payload is not valid JSON is skipped.
+
+    Args:
+        path: Path to the audit log
+
+    Yields:
+        Dictionaries with "time", "action" and "details" keys
+    """
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(_FRAME_LENGTH.size)
+            if len(header) < _FRAME_LENGTH.size:
+                return
+            (length,) = _FRAME_LENGTH.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            try:
+                event = json.loads(payload)
+            except ValueError:
+                continue
+            yield event
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The stock QueueHandler merges the arguments into the message before
+    enqueueing, which would run sanitization and formatting on the
+    caller's thread and hide the arguments from SanitizeFilter.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info:
+            # Tracebacks hold frames from this thread; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class PassMgrLogger:
     """
     Centralized logging for the password manager.
@@ -61,6 +244,7 @@ class PassMgrLogger:
 
     DEFAULT_LOG_DIR = os.path.expanduser("~/.pwmgr/logs")
     DEFAULT_LOG_FILE = "pwmgr.log"
+    AUDIT_LOG_FILE = "audit.log"
 
     def __init__(self, name: str = "pwmgr", log_dir: Optional[str] = None, level: int = logging.INFO):
         """
@@ -73,12 +257,20 @@ class PassMgrLogger:
         """
         self.name = name
         self.log_dir = log_dir or self.DEFAULT_LOG_DIR
+        self.audit_log_path = os.path.join(self.log_dir, self.AUDIT_LOG_FILE)
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._queue_handler: Optional[logging.Handler] = None
         self._setup_handlers()
 
     def _setup_handlers(self):
-        """Set up log handlers."""
+        """
+        Set up log handlers.
+
+        File and console output run on a QueueListener thread so that
+        logging calls never block on disk I/O.
+        """
         # Avoid adding duplicate handlers
         if self.logger.handlers:
             return
@@ -95,25 +287,60 @@ class PassMgrLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        file_handler.addFilter(SanitizeFilter())
+        # Audit events go to the binary audit log instead
+        file_handler.addFilter(_is_not_audit_record)
+
+        # Audit handler
+        audit_handler = AuditBinaryHandler(self.audit_log_path)
+        audit_handler.setLevel(logging.DEBUG)
+        audit_handler.addFilter(_is_audit_record)
 
         # Console handler (only for warnings and above by default)
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.WARNING)
         console_formatter = AuditLogFormatter('%(levelname)s: %(message)s')
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        console_handler.addFilter(SanitizeFilter())
+
+        log_queue = queue.Queue(-1)
+        self._queue_handler = _DeferredQueueHandler(log_queue)
+        self.logger.addHandler(self._queue_handler)
+        self._listener = logging.handlers.QueueListener(
+            log_queue, file_handler, audit_handler, console_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        # Flush pending records on exit
+        atexit.register(self.close)
+
+    def close(self):
+        """
+        Stop the background listener, flushing any queued records.
+
+        The queue handler is detached first so no record can be queued after
+        the listener has stopped, then the underlying handlers are closed.
+        """
+        if self._queue_handler is not None:
+            self.logger.removeHandler(self._queue_handler)
+            self._queue_handler.close()
+            self._queue_handler = None
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
 
     def audit(self, action: str, details: Optional[dict] = None):
         """
-        Log an audit event.
+        Log an audit event to the binary audit log.
 
         Args:
             action: The action being performed
             details: Additional details (will be sanitized)
         """
-        sanitized_details = sanitize_data(details) if details else {}
-        self.logger.info(f"AUDIT: {action} | {json.dumps(sanitized_details)}")
+        details = details or {}
+        self.logger.info("AUDIT: %s | %s", action, _LazyJson(details),
+                         extra={'audit_action': action, 'audit_details': details})
 
     def debug(self, message: str, *args):
         """Log a debug message."""
@@ -136,6 +363,10 @@ class PassMgrLogger:
         self.logger.exception(message, *args)
 
 
+# Length prefix of each binary audit log frame
+_FRAME_LENGTH = struct.Struct('<I')
+
+
 # Global logger instance
 _logger: Optional[PassMgrLogger] = None
 
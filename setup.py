@@ -20,9 +20,15 @@ setup(
     ],
     python_requires=">=3.10",
     install_requires=[
-        "cryptography>=41.0.0",
+        "cryptography>=42.0.0",
+        "argon2-cffi>=23.1.0",
         "click>=8.1.0",
+        "msgspec>=0.18.0",
     ],
+    extras_require={
+        # Faster JSON encoding for log records; the stdlib is used otherwise
+        "fast": ["orjson>=3.8.0"],
+    },
     entry_points={
         "console_scripts": [
             "pwmgr=pwmgr.cli:cli",
@@ -7,6 +7,12 @@ import string
 from pwmgr.core.generator import PasswordGenerator, PasswordStrength
 
 
+LOWERCASE_SET = frozenset(string.ascii_lowercase)
+UPPERCASE_SET = frozenset(string.ascii_uppercase)
+DIGITS_SET = frozenset(string.digits)
+SYMBOLS_SET = frozenset(PasswordGenerator.SYMBOLS)
+
+
 class TestPasswordGenerator:
     """Test cases for PasswordGenerator."""
 
@@ -15,10 +21,11 @@ class TestPasswordGenerator:
         password = PasswordGenerator.generate()
 
         assert len(password) == 16
-        assert any(c in string.ascii_lowercase for c in password)
-        assert any(c in string.ascii_uppercase for c in password)
-        assert any(c in string.digits for c in password)
-        assert any(c in PasswordGenerator.SYMBOLS for c in password)
+        chars = set(password)
+        assert chars & LOWERCASE_SET
+        assert chars & UPPERCASE_SET
+        assert chars & DIGITS_SET
+        assert chars & SYMBOLS_SET
 
     def test_generate_custom_length(self):
         """Test generating a password with custom length."""
@@ -26,57 +33,22 @@ class TestPasswordGenerator:
 
         assert len(password) == 24
 
-    def test_generate_lowercase_only(self):
-        """Test generating a password with only lowercase letters."""
-        password = PasswordGenerator.generate(
-            length=16,
-            include_lowercase=True,
-            include_uppercase=False,
-            include_digits=False,
-            include_symbols=False
-        )
-
-        assert len(password) == 16
-        assert all(c in string.ascii_lowercase for c in password)
-
-    def test_generate_uppercase_only(self):
-        """Test generating a password with only uppercase letters."""
-        password = PasswordGenerator.generate(
-            length=16,
-            include_lowercase=False,
-            include_uppercase=True,
-            include_digits=False,
-            include_symbols=False
-        )
-
-        assert len(password) == 16
-        assert all(c in string.ascii_uppercase for c in password)
-
-    def test_generate_digits_only(self):
-        """Test generating a password with only digits."""
-        password = PasswordGenerator.generate(
-            length=16,
-            include_lowercase=False,
-            include_uppercase=False,
-            include_digits=True,
-            include_symbols=False
-        )
-
-        assert len(password) == 16
-        assert all(c in string.digits for c in password)
+    @pytest.mark.parametrize("flag,alphabet", [
+        ("include_lowercase", LOWERCASE_SET),
+        ("include_uppercase", UPPERCASE_SET),
+        ("include_digits", DIGITS_SET),
+        ("include_symbols", SYMBOLS_SET),
+    ])
+    def test_generate_single_character_set(self, flag, alphabet):
+        """Test generating a password from a single character set."""
+        flags = dict(include_lowercase=False, include_uppercase=False,
+                     include_digits=False, include_symbols=False)
+        flags[flag] = True
 
-    def test_generate_symbols_only(self):
-        """Test generating a password with only symbols."""
-        password = PasswordGenerator.generate(
-            length=16,
-            include_lowercase=False,
-            include_uppercase=False,
-            include_digits=False,
-            include_symbols=True
-        )
+        password = PasswordGenerator.generate(length=16, **flags)
 
         assert len(password) == 16
-        assert all(c in PasswordGenerator.SYMBOLS for c in password)
+        assert set(password) <= alphabet
 
     def test_generate_minimum_length(self):
         """Test generating password with minimum length for selected character types."""
@@ -101,7 +73,7 @@ class TestPasswordGenerator:
         )
 
         assert len(password) == 16
-        assert all(c in string.ascii_lowercase for c in password)
+        assert set(password) <= LOWERCASE_SET
 
     def test_generate_unique_passwords(self):
         """Test that multiple generated passwords are unique."""
@@ -110,17 +82,18 @@ class TestPasswordGenerator:
         # All passwords should be unique (extremely high probability with secure random)
         assert len(set(passwords)) == 100
 
-    def test_secure_shuffle(self):
-        """Test that secure shuffle works."""
-        items = list(range(20))
-        original = items.copy()
-
-        PasswordGenerator._secure_shuffle(items)
-
-        # Items should contain same elements
-        assert set(items) == set(original)
-        # Items should be shuffled (extremely unlikely to remain the same)
-        assert items != original
+    def test_generate_many(self):
+        """Test that batch generation honours length and character set rules."""
+        passwords = PasswordGenerator.generate_many(50, length=4)
+
+        assert len(passwords) == 50
+        for password in passwords:
+            assert len(password) == 4
+            chars = set(password)
+            assert chars & LOWERCASE_SET
+            assert chars & UPPERCASE_SET
+            assert chars & DIGITS_SET
+            assert chars & SYMBOLS_SET
 
     def test_check_password_strength_very_strong(self):
         """Test password strength checking for very strong passwords."""
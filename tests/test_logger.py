@@ -0,0 +1,113 @@
+"""
+Tests for the logger.
+"""
+import pytest
+import os
+import tempfile
+
+from pwmgr.logger import PassMgrLogger, sanitize_data, read_audit_log
+
+
+class TestLogger:
+    """Test cases for logging and sanitization."""
+
+    @pytest.fixture
+    def temp_logger(self, request):
+        """Create a logger writing to a temporary directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            logger = PassMgrLogger(name=f"pwmgr.test.{request.node.name}", log_dir=temp_dir)
+            yield logger
+            logger.close()
+
+    def test_sanitize_data(self):
+        """Test that sensitive keys and key:value strings are redacted."""
+        data = {
+            "Password": "hunter2",
+            "user": "alice",
+            "nested": [{"token": "abc"}, "secret: xyz", "no secrets here"],
+        }
+
+        sanitized = sanitize_data(data)
+
+        assert sanitized["Password"] == "***REDACTED***"
+        assert sanitized["user"] == "alice"
+        assert sanitized["nested"] == [{"token": "***REDACTED***"}, "***REDACTED***", "no secrets here"]
+        # The input is left untouched
+        assert data["Password"] == "hunter2"
+
+    @pytest.mark.parametrize("value", [
+        "db_password: x",
+        '{"password": "x"}',
+        "my password is: hunter2",
+        "API_KEY=abc:def",
+    ])
+    def test_sanitize_data_redacts_embedded_fields(self, value):
+        """Test that any string mentioning a sensitive field next to a colon is redacted."""
+        assert sanitize_data(value) == "***REDACTED***"
+
+    def test_sanitize_data_self_reference(self):
+        """Test that a self-referencing container terminates and keeps its shape."""
+        data = {"name": "github", "token": "abc"}
+        data["self"] = data
+
+        sanitized = sanitize_data(data)
+
+        assert sanitized["token"] == "***REDACTED***"
+        assert sanitized["self"] is sanitized
+
+    def test_audit_log_round_trip(self, temp_logger):
+        """Test that audit events are written to and read from the binary log."""
+        temp_logger.audit("ADD_ENTRY", {"name": "github", "password": "hunter2"})
+        temp_logger.audit("DELETE_ENTRY")
+        temp_logger.close()
+
+        events = list(read_audit_log(temp_logger.audit_log_path))
+
+        assert [event["action"] for event in events] == ["ADD_ENTRY", "DELETE_ENTRY"]
+        assert events[0]["details"] == {"name": "github", "password": "***REDACTED***"}
+        assert events[1]["details"] == {}
+
+    def test_audit_log_ignores_truncated_frame(self, temp_logger):
+        """Test that a partially written trailing frame is skipped."""
+        temp_logger.audit("ADD_ENTRY", {"name": "github"})
+        temp_logger.close()
+
+        with open(temp_logger.audit_log_path, 'ab') as f:
+            f.write(b"\x40\x00\x00\x00{\"time\"")
+
+        events = list(read_audit_log(temp_logger.audit_log_path))
+        assert [event["action"] for event in events] == ["ADD_ENTRY"]
+
+    def test_audit_log_skips_corrupt_frame(self, temp_logger):
+        """Test that a complete frame holding invalid JSON is skipped."""
+        temp_logger.audit("ADD_ENTRY", {"name": "github"})
+        temp_logger.close()
+
+        with open(temp_logger.audit_log_path, 'ab') as f:
+            f.write(b"\x05\x00\x00\x00{bad}")
+        temp_logger = PassMgrLogger(name=temp_logger.name, log_dir=temp_logger.log_dir)
+        temp_logger.audit("DELETE_ENTRY")
+        temp_logger.close()
+
+        events = list(read_audit_log(temp_logger.audit_log_path))
+        assert [event["action"] for event in events] == ["ADD_ENTRY", "DELETE_ENTRY"]
+
+    def test_audit_events_not_in_text_log(self, temp_logger):
+        """Test that audit events stay out of the text log."""
+        temp_logger.audit("ADD_ENTRY", {"name": "github"})
+        temp_logger.info("plain message")
+        temp_logger.close()
+
+        with open(os.path.join(temp_logger.log_dir, temp_logger.DEFAULT_LOG_FILE)) as f:
+            content = f.read()
+
+        assert "plain message" in content
+        assert "ADD_ENTRY" not in content
+
+    def test_close_detaches_queue_handler(self, temp_logger):
+        """Test that close() leaves no queue handler behind to swallow records."""
+        temp_logger.close()
+
+        assert temp_logger.logger.handlers == []
+        # Closing twice is harmless
+        temp_logger.close()
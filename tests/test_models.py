@@ -110,6 +110,30 @@ class TestPasswordEntry:
         assert entry.created_at is not None
         assert entry.updated_at is not None
 
+    def test_from_dict_with_loosely_typed_fields(self):
+        """Test that nulls and numbers in string fields are coerced, not rejected."""
+        data = {
+            "name": 42,
+            "username": None,
+            "password": 1234,
+            "notes": None,
+            "created_at": None,
+        }
+
+        entry = PasswordEntry.from_dict(data)
+
+        assert entry.name == "42"
+        assert entry.username == ""
+        assert entry.password == "1234"
+        assert entry.notes is None
+        assert entry.id is not None
+        datetime.fromisoformat(entry.created_at)
+
+    def test_from_dict_missing_required_field(self):
+        """Test that a missing required field is still rejected."""
+        with pytest.raises(KeyError):
+            PasswordEntry.from_dict({"name": "TestSite", "username": None})
+
     def test_unique_id_generation(self):
         """Test that each entry gets a unique ID."""
         entry1 = PasswordEntry(name="Site1", username="user1", password="pass1")
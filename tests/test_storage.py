@@ -2,23 +2,74 @@
 Tests for PasswordStorage.
 """
 import pytest
+import hashlib
+import hmac
 import os
 import tempfile
+import uuid
+from typing import List
+
+import msgspec
 
 from pwmgr.core.storage import PasswordStorage
 from pwmgr.core.models import PasswordEntry
+from pwmgr.crypto import EncryptionService
+
+
+class NullCrypto:
+    """
+    Stand-in for EncryptionService that skips the KDF and cipher.
+
+    Blobs are a marker, a password digest and the plaintext, so wrong
+    passwords are still rejected. Only for tests of storage semantics.
+    """
+
+    MARKER = b"NULL:"
+
+    @staticmethod
+    def encrypt_password_data(data, master_password, *kdf_params, salt=None):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return NullCrypto.MARKER + hashlib.sha256(master_password.encode('utf-8')).digest() + data
+
+    @staticmethod
+    def decrypt_password_data(encrypted_data, master_password):
+        digest = hashlib.sha256(master_password.encode('utf-8')).digest()
+        header = NullCrypto.MARKER + digest
+        if not hmac.compare_digest(encrypted_data[:len(header)], header):
+            return None
+        return encrypted_data[len(header):].decode('utf-8')
+
+    @staticmethod
+    def get_kdf_params(encrypted_data):
+        return None
+
+    @staticmethod
+    def get_salt(encrypted_data):
+        return None
+
+
+@pytest.fixture(scope="class")
+def shared_temp_dir():
+    """Create one temporary directory per test class; tests use unique file names."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
 
 
 class TestPasswordStorage:
     """Test cases for PasswordStorage."""
 
     @pytest.fixture
-    def temp_storage(self):
-        """Create a temporary storage for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            file_path = os.path.join(temp_dir, "test_passwords.json.enc")
-            storage = PasswordStorage(file_path)
-            yield storage
+    def temp_storage(self, shared_temp_dir):
+        """Create a temporary storage without real encryption for testing."""
+        file_path = os.path.join(shared_temp_dir, f"test_passwords_{uuid.uuid4().hex}.json.enc")
+        return PasswordStorage(file_path, crypto=NullCrypto)
+
+    @pytest.fixture
+    def real_storage(self, shared_temp_dir):
+        """Create a temporary storage using EncryptionService for testing."""
+        file_path = os.path.join(shared_temp_dir, f"test_passwords_{uuid.uuid4().hex}.json.enc")
+        return PasswordStorage(file_path)
 
     @pytest.fixture
     def temp_storage_with_data(self, temp_storage):
@@ -35,6 +86,54 @@ class TestPasswordStorage:
         temp_storage.initialize(master_password)
         assert temp_storage.file_exists()
 
+    def test_kdf_time_cost_preserved(self, real_storage):
+        """Test that the vault's KDF cost survives a load and save."""
+        real_storage.initialize("password", time_cost=4)
+
+        reopened = PasswordStorage(real_storage.file_path)
+        reopened.save(reopened.load("password"), "password")
+
+        with open(real_storage.file_path, 'rb') as f:
+            assert EncryptionService.get_kdf_params(f.read())[0] == 4
+
+    def test_kdf_time_cost_preserved_without_load(self, real_storage):
+        """Test that saving through a fresh instance keeps the vault's KDF cost."""
+        real_storage.initialize("password", time_cost=4)
+
+        PasswordStorage(real_storage.file_path).save([], "password")
+
+        with open(real_storage.file_path, 'rb') as f:
+            assert EncryptionService.get_kdf_params(f.read())[0] == 4
+
+    def test_initialize_rejects_out_of_range_time_cost(self, real_storage):
+        """Test that an unreadable KDF cost is refused instead of written."""
+        with pytest.raises(ValueError):
+            real_storage.initialize("password", time_cost=EncryptionService.ARGON2_MAX_TIME_COST + 1)
+
+        assert not real_storage.file_exists()
+
+    def test_save_reuses_derived_key(self, real_storage, monkeypatch):
+        """Test that saving an unlocked vault keeps its salt and skips the KDF."""
+        storage, master_password = real_storage, "test_master_password"
+        storage.initialize(master_password)
+        EncryptionService.clear_key_cache()
+
+        calls = []
+        derive = EncryptionService.derive_key_argon2
+        monkeypatch.setattr(EncryptionService, "derive_key_argon2",
+                            staticmethod(lambda *args: calls.append(args) or derive(*args)))
+
+        reopened = PasswordStorage(storage.file_path)
+        entries = reopened.load(master_password)
+        entries.append(PasswordEntry(name="Site1", username="user1", password="pass1"))
+        reopened.save(entries, master_password)
+        reopened.save(entries, master_password)
+
+        assert len(calls) == 1
+        with open(storage.file_path, 'rb') as f:
+            assert EncryptionService.get_salt(f.read()) == reopened._salt
+        assert len(reopened.load(master_password)) == 1
+
     def test_save_and_load_entries(self, temp_storage_with_data):
         """Test saving and loading password entries."""
         storage, master_password = temp_storage_with_data
@@ -52,9 +151,45 @@ class TestPasswordStorage:
         assert loaded_entries[1].name == "Site2"
         assert loaded_entries[1].notes == "Test notes"
 
-    def test_load_with_wrong_password(self, temp_storage_with_data):
-        """Test that loading with wrong password returns None."""
+    @pytest.mark.parametrize("count", [10, 1000])
+    def test_save_and_load_bulk(self, temp_storage_with_data, count):
+        """Test that large vaults round-trip intact."""
+        storage, master_password = temp_storage_with_data
+
+        entries = msgspec.convert(
+            [{"name": f"Site{i}", "username": f"user{i}", "password": f"pass{i}"} for i in range(count)],
+            type=List[PasswordEntry],
+        )
+
+        storage.save(entries, master_password)
+        loaded_entries = storage.load(master_password)
+
+        assert loaded_entries == entries
+
+    def test_load_legacy_base64_vault(self, real_storage):
+        """Test that vaults written as base64 text still load."""
+        encrypted = EncryptionService.encrypt_password_data_b64('{"entries": []}', "password")
+        with open(real_storage.file_path, 'w') as f:
+            f.write(encrypted)
+
+        assert real_storage.load("password") == []
+        assert real_storage.load("wrong_password") is None
+
+    def test_load_loosely_typed_vault(self, temp_storage_with_data):
+        """Test that vaults holding nulls or numbers in string fields still load."""
         storage, master_password = temp_storage_with_data
+        vault = '{"entries": [{"id": "abc", "name": "Site1", "username": null, "password": 1234}]}'
+        with open(storage.file_path, 'wb') as f:
+            f.write(NullCrypto.encrypt_password_data(vault, master_password))
+
+        loaded = storage.load(master_password)
+
+        assert [(e.id, e.name, e.username, e.password) for e in loaded] == [("abc", "Site1", "", "1234")]
+
+    def test_load_with_wrong_password(self, real_storage):
+        """Test that AES-GCM rejects a vault loaded with the wrong password."""
+        storage, master_password = real_storage, "test_master_password"
+        storage.initialize(master_password)
 
         entries = [PasswordEntry(name="Site1", username="user1", password="pass1")]
         storage.save(entries, master_password)
@@ -139,12 +274,10 @@ class TestPasswordStorageSecurity:
     """Test security features of PasswordStorage."""
 
     @pytest.fixture
-    def temp_storage(self):
+    def temp_storage(self, shared_temp_dir):
         """Create a temporary storage for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            file_path = os.path.join(temp_dir, "test_passwords.json.enc")
-            storage = PasswordStorage(file_path)
-            yield storage
+        file_path = os.path.join(shared_temp_dir, f"test_passwords_{uuid.uuid4().hex}.json.enc")
+        return PasswordStorage(file_path)
 
     def test_encrypted_file_content(self, temp_storage):
         """Test that file content is encrypted, not plaintext."""
@@ -153,10 +286,23 @@ class TestPasswordStorageSecurity:
 
         temp_storage.save(entries, master_password)
 
-        with open(temp_storage.file_path, 'r') as f:
+        with open(temp_storage.file_path, 'rb') as f:
             content = f.read()
 
         # Plaintext data should not appear in file
-        assert "SecretSite" not in content
-        assert "secretuser" not in content
-        assert "secretpass" not in content
+        assert b"SecretSite" not in content
+        assert b"secretuser" not in content
+        assert b"secretpass" not in content
+
+    @pytest.mark.skipif(os.name != 'posix', reason="Unix permission bits")
+    def test_saved_file_is_owner_only(self, temp_storage):
+        """Test that the vault is 0600 even if a stale temp file was world-readable."""
+        temp_file = temp_storage.file_path + '.tmp'
+        with open(temp_file, 'wb'):
+            pass
+        os.chmod(temp_file, 0o644)
+
+        temp_storage.initialize("password")
+
+        assert os.stat(temp_storage.file_path).st_mode & 0o777 == 0o600
+        assert not os.path.exists(temp_file)